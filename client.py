@@ -1,64 +1,203 @@
 # mcp_modules/ageni-qdrant/client.py
 import os
+import threading
 import openai
 import requests
 from typing import List, Dict, Any, Optional, Tuple
 from .config import Config
+from .resilience import Resilience, ResultCache, TransientError
+
+# Errors that mean the backend is unreachable or overloaded rather than rejecting the request
+OPENROUTER_RETRY_ON = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+QDRANT_RETRY_ON = (requests.ConnectionError, requests.Timeout, TransientError)
+
+class _OpenRouterEndpoint:
+    """OpenAI client, model names and cached embeddings for one OpenRouter configuration."""
+    
+    def __init__(self, api_key: Optional[str], base_url: str, client: Optional[openai.OpenAI],
+                 model: str, embedding_model: str, embedding_cache: Optional[ResultCache] = None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.client = client
+        self.model = model
+        self.embedding_model = embedding_model
+        # Keyed by (embedding_model, text), so it can outlive a model change
+        self.embedding_cache = embedding_cache if embedding_cache is not None else ResultCache()
+    
+    def require_client(self) -> openai.OpenAI:
+        """Get the OpenAI client, raising if no API key is configured."""
+        if self.client is None:
+            raise RuntimeError("OpenRouter API key is not configured")
+        return self.client
 
 class OpenRouterClient:
     """Client for OpenRouter API to handle embeddings and text generation."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, resilience: Optional[Resilience] = None):
         self.config = config
-        self.api_key = config.get("openrouter.api_key")
-        self.model = config.get("openrouter.model", "openai/gpt-4o")
-        self.embedding_model = config.get("memory.embedding_model", "openai/text-embedding-ada-002")
-        self.base_url = "https://openrouter.ai/api/v1"
+        self.resilience = resilience or Resilience("openrouter", config)
+        self._lock = threading.Lock()
+        self._endpoint = None
+        self.configure()
+    
+    def configure(self) -> None:
+        """Apply the current configuration to this client.
+        
+        The OpenAI client, breaker and cached embeddings are kept unless the API
+        key or base URL changed. New settings are swapped in as a single step, so
+        requests already in flight finish with the settings they started with.
+        """
+        api_key = self.config.get("openrouter.api_key")
+        base_url = self.config.get("openrouter.base_url", "https://openrouter.ai/api/v1").rstrip("/")
+        model = self.config.get("openrouter.model", "openai/gpt-4o")
+        embedding_model = self.config.get("memory.embedding_model", "openai/text-embedding-ada-002")
+        
+        with self._lock:
+            current = self._endpoint
+            self.api_key = api_key
+            self.base_url = base_url
+            self.model = model
+            self.embedding_model = embedding_model
+            
+            if current is not None and (current.api_key, current.base_url) == (api_key, base_url):
+                if (current.model, current.embedding_model) != (model, embedding_model):
+                    self._endpoint = _OpenRouterEndpoint(api_key, base_url, current.client, model,
+                                                         embedding_model, current.embedding_cache)
+                return
+            
+            # Set up OpenAI client; retries are handled by the resilience layer.
+            # A missing key fails at request time rather than here.
+            client = openai.OpenAI(api_key=api_key, base_url=f"{base_url}/", max_retries=0) if api_key else None
+            self._endpoint = _OpenRouterEndpoint(api_key, base_url, client, model, embedding_model)
+            self.resilience.reset()
         
-        # Set up OpenAI client
-        openai.api_key = self.api_key
-        openai.base_url = f"{self.base_url}/"
-        openai.api_type = "openai"
+        if current is not None and current.client is not None:
+            current.client.close()
     
-    def get_embedding(self, text: str) -> List[float]:
-        """Get embedding for a text using OpenRouter API."""
+    def close(self) -> None:
+        """Close the OpenAI client and the hedge pool."""
+        self.resilience.close()
+        client = self._endpoint.client
+        if client is not None:
+            client.close()
+    
+    def _embed(self, endpoint: _OpenRouterEndpoint, text: str) -> List[float]:
+        """Get an embedding, raising on failure."""
+        client = endpoint.require_client()
+        response = self.resilience.call(
+            "embedding",
+            lambda timeout: client.embeddings.create(
+                model=endpoint.embedding_model,
+                input=text,
+                timeout=timeout
+            ),
+            retry_on=OPENROUTER_RETRY_ON
+        )
+        embedding = response.data[0].embedding
+        endpoint.embedding_cache.put((endpoint.embedding_model, text), embedding)
+        return embedding
+    
+    def get_embedding(self, text: str, use_cache: bool = False) -> List[float]:
+        """Get embedding for a text using OpenRouter API.
+        
+        With use_cache, a failed call falls back to the last embedding of the same text.
+        """
+        endpoint = self._endpoint
         try:
-            response = openai.embeddings.create(
-                model=self.embedding_model,
-                input=text
-            )
-            return response.data[0].embedding
+            return self._embed(endpoint, text)
         except Exception as e:
             print(f"Error getting embedding: {e}")
-            return []
+            return endpoint.embedding_cache.get((endpoint.embedding_model, text), []) if use_cache else []
+    
+    def check_connection(self) -> None:
+        """Make a live embedding request, raising the underlying error on failure."""
+        self._embed(self._endpoint, "test")
     
     def generate_text(self, prompt: str, max_tokens: int = 100) -> str:
         """Generate text using OpenRouter API."""
+        endpoint = self._endpoint
         try:
-            response = openai.completions.create(
-                model=self.model,
-                prompt=prompt,
-                max_tokens=max_tokens
+            client = endpoint.require_client()
+            response = self.resilience.call(
+                "generate",
+                lambda timeout: client.completions.create(
+                    model=endpoint.model,
+                    prompt=prompt,
+                    max_tokens=max_tokens,
+                    timeout=timeout
+                ),
+                retry_on=OPENROUTER_RETRY_ON
             )
             return response.choices[0].text
         except Exception as e:
             print(f"Error generating text: {e}")
             return ""
 
+class _QdrantEndpoint:
+    """Address, headers and cached results for one Qdrant server."""
+    
+    def __init__(self, base_url: str, headers: Dict[str, str]):
+        self.base_url = base_url
+        self.headers = headers
+        self.search_cache = ResultCache()
+        self.collections = None
+
 class QdrantClient:
     """Client for Qdrant vector database operations."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, resilience: Optional[Resilience] = None):
         self.config = config
-        self.host = config.get("qdrant.host", "localhost")
-        self.port = config.get("qdrant.port", 6333)
-        self.api_key = config.get("qdrant.api_key")
-        self.base_url = f"http://{self.host}:{self.port}"
-        
-        # Set up session with API key if provided
         self.session = requests.Session()
-        if self.api_key:
-            self.session.headers.update({"api-key": self.api_key})
+        self.resilience = resilience or Resilience("qdrant", config)
+        self._lock = threading.Lock()
+        self._endpoint = None
+        self.configure()
+    
+    def configure(self) -> None:
+        """Apply the current configuration, keeping the existing HTTP session.
+        
+        The endpoint, breaker and cached results are kept unless the host, port
+        or API key changed. A new endpoint is swapped in as a single step, so
+        requests already in flight finish against the server they started with.
+        """
+        host = self.config.get("qdrant.host", "localhost")
+        port = self.config.get("qdrant.port", 6333)
+        api_key = self.config.get("qdrant.api_key")
+        
+        # Send the API key per request rather than mutating the shared session
+        base_url = f"http://{host}:{port}"
+        headers = {"api-key": api_key} if api_key else {}
+        
+        with self._lock:
+            current = self._endpoint
+            if current is not None and (current.base_url, current.headers) == (base_url, headers):
+                return
+            
+            self.host = host
+            self.port = port
+            self.api_key = api_key
+            self.base_url = base_url
+            self._endpoint = _QdrantEndpoint(base_url, headers)
+            # A different server starts with a fresh breaker
+            self.resilience.reset()
+    
+    def close(self) -> None:
+        """Close the HTTP session and the hedge pool."""
+        self.resilience.close()
+        self.session.close()
+    
+    def _request(self, endpoint: _QdrantEndpoint, operation: str, method: str, path: str,
+                 hedge: bool = False, **kwargs) -> requests.Response:
+        """Send a request to endpoint through the resilience layer."""
+        url = f"{endpoint.base_url}{path}"
+        
+        def send(timeout: float) -> requests.Response:
+            response = self.session.request(method, url, headers=endpoint.headers, timeout=timeout, **kwargs)
+            if response.status_code == 429 or response.status_code >= 500:
+                raise TransientError(f"Qdrant returned {response.status_code} for {operation}")
+            return response
+        
+        return self.resilience.call(operation, send, retry_on=QDRANT_RETRY_ON, hedge=hedge)
     
     def _collection_name(self, context: str) -> str:
         """Generate collection name based on context."""
@@ -71,8 +210,8 @@ class QdrantClient:
     
     def create_collection(self, collection_name: str) -> bool:
         """Create a new collection in Qdrant."""
+        endpoint = self._endpoint
         try:
-            url = f"{self.base_url}/collections/{collection_name}"
             payload = {
                 "vectors": {
                     "size": self.config.get("memory.vector_size", 1536),
@@ -84,7 +223,7 @@ class QdrantClient:
                 }
             }
             
-            response = self.session.put(url, json=payload)
+            response = self._request(endpoint, "create_collection", "PUT", f"/collections/{collection_name}", json=payload)
             return response.status_code in [200, 201]
         except Exception as e:
             print(f"Error creating collection: {e}")
@@ -92,42 +231,64 @@ class QdrantClient:
     
     def upsert_vectors(self, collection_name: str, vectors: List[Dict]) -> bool:
         """Upsert vectors to a collection."""
+        endpoint = self._endpoint
         try:
-            url = f"{self.base_url}/collections/{collection_name}/points"
             payload = {"points": vectors}
             
-            response = self.session.put(url, json=payload)
+            response = self._request(endpoint, "upsert", "PUT", f"/collections/{collection_name}/points", json=payload)
             return response.status_code == 200
         except Exception as e:
             print(f"Error upserting vectors: {e}")
             return False
     
-    def search_vectors(self, collection_name: str, vector: List[float], limit: int = 10) -> List[Dict]:
-        """Search for similar vectors in a collection."""
+    def search_vectors(self, collection_name: str, vector: List[float], limit: int = 10,
+                       use_cache: bool = False) -> List[Dict]:
+        """Search for similar vectors in a collection.
+        
+        With use_cache, a failed search falls back to the last results for the same query.
+        """
+        endpoint = self._endpoint
+        cache_key = (collection_name, limit, tuple(vector))
         try:
-            url = f"{self.base_url}/collections/{collection_name}/points/search"
             payload = {
                 "vector": vector,
                 "limit": limit,
                 "with_payload": True
             }
             
-            response = self.session.post(url, json=payload)
+            # Searches are idempotent, so a slow one may be hedged
+            hedge = self.resilience.setting("hedge_searches")
+            response = self._request(endpoint, "search", "POST", f"/collections/{collection_name}/points/search",
+                                     hedge=hedge, json=payload)
             if response.status_code == 200:
-                return response.json()["result"]
+                results = response.json()["result"]
+                endpoint.search_cache.put(cache_key, results)
+                return results
             return []
         except Exception as e:
             print(f"Error searching vectors: {e}")
-            return []
+            return endpoint.search_cache.get(cache_key, []) if use_cache else []
+    
+    def _fetch_collections(self, endpoint: _QdrantEndpoint) -> List[str]:
+        """List collection names, raising on failure."""
+        response = self._request(endpoint, "list_collections", "GET", "/collections")
+        if response.status_code != 200:
+            raise RuntimeError(f"Qdrant returned {response.status_code} for list_collections")
+        endpoint.collections = [col["name"] for col in response.json()["result"]["collections"]]
+        return list(endpoint.collections)
     
-    def list_collections(self) -> List[str]:
-        """List all collections in Qdrant."""
+    def list_collections(self, use_cache: bool = False) -> List[str]:
+        """List all collections in Qdrant.
+        
+        With use_cache, a failed call falls back to the last known collections.
+        """
+        endpoint = self._endpoint
         try:
-            url = f"{self.base_url}/collections"
-            response = self.session.get(url)
-            if response.status_code == 200:
-                return [col["name"] for col in response.json()["result"]["collections"]]
-            return []
+            return self._fetch_collections(endpoint)
         except Exception as e:
             print(f"Error listing collections: {e}")
-            return []
\ No newline at end of file
+            return list(endpoint.collections or []) if use_cache else []
+    
+    def check_connection(self) -> List[str]:
+        """List collections live, raising the underlying error on failure."""
+        return self._fetch_collections(self._endpoint)
\ No newline at end of file
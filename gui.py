@@ -1,26 +1,40 @@
 # mcp_modules/ageni-qdrant/gui.py
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from .config import Config
 from .memory_manager import MemoryManager
+from .operations import OperationRunner, OperationStats
 
 class MemoryGUI:
     """GUI for the AgeniQdrant memory management system."""
     
+    MAX_WORKERS = 4
+    UI_POLL_MS = 50
+    UI_BATCH_SIZE = 20
+    RENDER_CHUNK_SIZE = 25
+    STATS_WINDOW = 50
+    
     def __init__(self, root: tk.Tk):
         self.root = root
         self.root.title("AgeniQdrant Memory Manager")
-        self.root.geometry("800x600")
+        self.root.geometry("800x700")
         
         # Configuration
         self.config = Config()
         self.memory_manager = None
         
+        # Background work: one bounded pool, results handed back to Tk via a queue
+        self.executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix="ageni-qdrant")
+        self.runner = OperationRunner(self.executor, OperationStats(self.STATS_WINDOW), on_record=self._update_perf_panel)
+        
         # Create GUI components
         self.create_widgets()
         self.update_status()
         
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        self.root.after(self.UI_POLL_MS, self._drain_ui_queue)
+        
     def create_widgets(self):
         """Create the main GUI widgets."""
         # Main notebook for different sections
@@ -129,12 +143,22 @@ class MemoryGUI:
         ttk.Label(self.memory_frame, text="Results:").grid(row=4, column=0, sticky=tk.W, padx=5, pady=5)
         self.results_text = scrolledtext.ScrolledText(self.memory_frame, width=60, height=15)
         self.results_text.grid(row=5, column=0, columnspan=2, padx=5, pady=5)
+        
+        # Performance panel
+        self.perf_frame = ttk.LabelFrame(self.memory_frame, text=f"Performance (last {self.STATS_WINDOW} operations)")
+        self.perf_frame.grid(row=6, column=0, columnspan=2, padx=5, pady=5, sticky=tk.W+tk.E)
+        
+        self.perf_label = ttk.Label(self.perf_frame, text="No operations yet")
+        self.perf_label.grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
     
     def update_status(self):
         """Update the status display."""
         if self.config.is_complete():
             self.config_status.config(text="Configuration complete", foreground="green")
-            self.memory_manager = MemoryManager(self.config)
+            if self.memory_manager is None:
+                self.memory_manager = MemoryManager(self.config)
+            else:
+                self.memory_manager.reload_config()
         else:
             self.config_status.config(text="Configuration incomplete", foreground="red")
             self.memory_manager = None
@@ -176,34 +200,82 @@ class MemoryGUI:
         self.update_status()
         messagebox.showinfo("Success", "Configuration saved successfully!")
     
+    def close(self):
+        """Stop background work and close the window."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.memory_manager is not None:
+            self.memory_manager.close()
+        self.root.destroy()
+    
+    def _submit(self, kind, func, on_success, error_prefix):
+        """Run func on the worker pool, reporting failures in the status bar."""
+        def on_error(error):
+            self.status_var.set(f"{error_prefix}: {str(error)}")
+        
+        return self.runner.submit(kind, func, on_success, on_error)
+    
+    def _drain_ui_queue(self):
+        """Apply queued UI updates in batches so the event loop stays responsive."""
+        try:
+            self.runner.drain(self.UI_BATCH_SIZE)
+        except Exception as e:
+            self.status_var.set(f"Error updating display: {str(e)}")
+        finally:
+            self.root.after(self.UI_POLL_MS, self._drain_ui_queue)
+    
+    def _update_perf_panel(self, stats):
+        """Refresh the performance panel from the operation stats."""
+        summary = stats.summary()
+        self.perf_label.config(
+            text=f"{summary['count']} ops | p50 {summary['p50_ms']:.0f} ms | p95 {summary['p95_ms']:.0f} ms | "
+                 f"max {summary['max_ms']:.0f} ms | {summary['throughput']:.2f} ops/s | {summary['errors']} errors"
+        )
+    
+    def _render_memories(self, generation, memories, start=0):
+        """Render memories into the results area a chunk at a time."""
+        if not self.runner.is_current("results", generation):
+            return
+        
+        lines = []
+        for i, memory in enumerate(memories[start:start + self.RENDER_CHUNK_SIZE], start):
+            lines.append(f"--- Memory {i+1} ---\n")
+            lines.append(f"Text: {memory.get('text', '')}\n")
+            lines.append(f"Type: {memory.get('type', '')}\n")
+            lines.append(f"Timestamp: {memory.get('timestamp', '')}\n")
+            lines.append(f"Keywords: {', '.join(memory.get('keywords', []))}\n")
+            lines.append("\n")
+        self.results_text.insert(tk.END, "".join(lines))
+        
+        start += self.RENDER_CHUNK_SIZE
+        if start < len(memories):
+            self.root.after_idle(self._render_memories, generation, memories, start)
+    
     def test_connection(self):
         """Test connection to OpenRouter and Qdrant."""
         if not self.config.is_complete():
             messagebox.showerror("Error", "Please complete the configuration first.")
             return
         
+        if self.memory_manager is None:
+            self.memory_manager = MemoryManager(self.config)
+        manager = self.memory_manager
+        
         def test():
+            # Live checks that bypass any cached results
             try:
-                # Test OpenRouter
-                manager = MemoryManager(self.config)
-                embedding = manager.openrouter_client.get_embedding("test")
-                
-                if not embedding:
-                    self.status_var.set("Error: Failed to connect to OpenRouter")
-                    return
-                
-                # Test Qdrant
-                collections = manager.qdrant_client.list_collections()
-                
-                self.status_var.set(f"Success: Connected to OpenRouter and Qdrant. Found {len(collections)} collections.")
-                
+                manager.openrouter_client.check_connection()
             except Exception as e:
-                self.status_var.set(f"Error: {str(e)}")
+                raise RuntimeError(f"Failed to connect to OpenRouter: {e}") from e
+            
+            try:
+                return manager.qdrant_client.check_connection()
+            except Exception as e:
+                raise RuntimeError(f"Failed to connect to Qdrant: {e}") from e
+        
+        def on_success(collections):
+            self.status_var.set(f"Success: Connected to OpenRouter and Qdrant. Found {len(collections)} collections.")
         
-        # Run in background thread
-        thread = threading.Thread(target=test)
-        thread.daemon = True
-        thread.start()
+        self._submit("test", test, on_success, "Error")
         self.status_var.set("Testing connections...")
     
     def add_memory(self):
@@ -224,20 +296,15 @@ class MemoryGUI:
             messagebox.showerror("Error", "Please enter a message.")
             return
         
-        def add():
-            try:
-                success = self.memory_manager.add_memory(message, context, message_type)
-                if success:
-                    self.status_var.set("Memory added successfully!")
-                else:
-                    self.status_var.set("Failed to add memory.")
-            except Exception as e:
-                self.status_var.set(f"Error adding memory: {str(e)}")
+        def on_success(success):
+            if success:
+                self.status_var.set("Memory added successfully!")
+            else:
+                self.status_var.set("Failed to add memory.")
         
-        # Run in background thread
-        thread = threading.Thread(target=add)
-        thread.daemon = True
-        thread.start()
+        # Adds are independent writes, so a new one never supersedes another
+        manager = self.memory_manager
+        self._submit(None, lambda: manager.add_memory(message, context, message_type), on_success, "Error adding memory")
         self.status_var.set("Adding memory...")
     
     def retrieve_memories(self):
@@ -257,30 +324,16 @@ class MemoryGUI:
             messagebox.showerror("Error", "Please enter a query.")
             return
         
-        def retrieve():
-            try:
-                memories = self.memory_manager.retrieve_memories(query, context)
-                self.results_text.delete("1.0", tk.END)
-                
-                if not memories:
-                    self.results_text.insert(tk.END, "No memories found.")
-                else:
-                    for i, memory in enumerate(memories):
-                        self.results_text.insert(tk.END, f"--- Memory {i+1} ---\n")
-                        self.results_text.insert(tk.END, f"Text: {memory['text']}\n")
-                        self.results_text.insert(tk.END, f"Type: {memory['type']}\n")
-                        self.results_text.insert(tk.END, f"Timestamp: {memory['timestamp']}\n")
-                        self.results_text.insert(tk.END, f"Keywords: {', '.join(memory['keywords'])}\n")
-                        self.results_text.insert(tk.END, "\n")
-                
-                self.status_var.set(f"Retrieved {len(memories)} memories.")
-            except Exception as e:
-                self.status_var.set(f"Error retrieving memories: {str(e)}")
+        def on_success(memories):
+            self.results_text.delete("1.0", tk.END)
+            if not memories:
+                self.results_text.insert(tk.END, "No memories found.")
+            else:
+                self._render_memories(generation, memories)
+            self.status_var.set(f"Retrieved {len(memories)} memories.")
         
-        # Run in background thread
-        thread = threading.Thread(target=retrieve)
-        thread.daemon = True
-        thread.start()
+        manager = self.memory_manager
+        generation = self._submit("results", lambda: manager.retrieve_memories(query, context), on_success, "Error retrieving memories")
         self.status_var.set("Retrieving memories...")
     
     def get_context_summary(self):
@@ -295,19 +348,13 @@ class MemoryGUI:
             messagebox.showerror("Error", "Please enter a context.")
             return
         
-        def get_summary():
-            try:
-                summary = self.memory_manager.get_context_summary(context)
-                self.results_text.delete("1.0", tk.END)
-                self.results_text.insert(tk.END, summary)
-                self.status_var.set("Context summary retrieved.")
-            except Exception as e:
-                self.status_var.set(f"Error getting context summary: {str(e)}")
+        def on_success(summary):
+            self.results_text.delete("1.0", tk.END)
+            self.results_text.insert(tk.END, summary)
+            self.status_var.set("Context summary retrieved.")
         
-        # Run in background thread
-        thread = threading.Thread(target=get_summary)
-        thread.daemon = True
-        thread.start()
+        manager = self.memory_manager
+        self._submit("results", lambda: manager.get_context_summary(context), on_success, "Error getting context summary")
         self.status_var.set("Getting context summary...")
 
 def main():
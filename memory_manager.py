@@ -13,6 +13,16 @@ class MemoryManager:
         self.openrouter_client = OpenRouterClient(config)
         self.qdrant_client = QdrantClient(config)
         self.keywords = self._load_keywords()
+    
+    def reload_config(self) -> None:
+        """Re-apply the configuration to the existing clients."""
+        self.openrouter_client.configure()
+        self.qdrant_client.configure()
+    
+    def close(self) -> None:
+        """Release the clients' connections and worker threads."""
+        self.openrouter_client.close()
+        self.qdrant_client.close()
         
     def _load_keywords(self) -> Dict[str, List[str]]:
         """Load keywords for memory categorization."""
@@ -108,13 +118,14 @@ class MemoryManager:
         collection_name = self.qdrant_client._collection_name(context)
         
         # Get embedding for query
-        embedding = self.openrouter_client.get_embedding(query)
+        # Reads may fall back to cached results while a backend is down
+        embedding = self.openrouter_client.get_embedding(query, use_cache=True)
         if not embedding:
             print("Failed to get embedding for query")
             return []
         
         # Search in Qdrant
-        results = self.qdrant_client.search_vectors(collection_name, embedding, limit)
+        results = self.qdrant_client.search_vectors(collection_name, embedding, limit, use_cache=True)
         
         # Filter results by similarity threshold
         threshold = self.config.get("memory.similarity_threshold", 0.75)
@@ -133,14 +144,14 @@ class MemoryManager:
         
         # Get all memories for the context
         collection_name = self.qdrant_client._collection_name(context)
-        all_collections = self.qdrant_client.list_collections()
+        all_collections = self.qdrant_client.list_collections(use_cache=True)
         
         if collection_name not in all_collections:
             return "No memories found for this context."
         
         # Get embeddings for a generic query to retrieve memories
-        embedding = self.openrouter_client.get_embedding("Get me all the important details about this context.")
-        memories = self.qdrant_client.search_vectors(collection_name, embedding, 20)
+        embedding = self.openrouter_client.get_embedding("Get me all the important details about this context.", use_cache=True)
+        memories = self.qdrant_client.search_vectors(collection_name, embedding, 20, use_cache=True)
         
         # Extract text from memories
         memory_texts = [mem["payload"]["text"] for mem in memories]
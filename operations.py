@@ -0,0 +1,117 @@
+# mcp_modules/ageni-qdrant/operations.py
+import queue
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+class OperationStats:
+    """Latency, throughput and error counts over the last N operations."""
+    
+    def __init__(self, window: int = 50):
+        self.window = window
+        self._operations = deque(maxlen=window)
+    
+    def record(self, started: float, finished: float, ok: bool) -> None:
+        """Record one finished operation."""
+        self._operations.append((started, finished, ok))
+    
+    def summary(self) -> Optional[Dict[str, float]]:
+        """Summarise the window, or return None if nothing has been recorded."""
+        if not self._operations:
+            return None
+        
+        latencies = sorted((finished - started) * 1000 for started, finished, _ in self._operations)
+        count = len(latencies)
+        span = max(finished for _, finished, _ in self._operations) - min(started for started, _, _ in self._operations)
+        
+        return {
+            "count": count,
+            "errors": sum(1 for _, _, ok in self._operations if not ok),
+            "p50_ms": latencies[(count - 1) // 2],
+            "p95_ms": latencies[min(count - 1, int(count * 0.95))],
+            "max_ms": latencies[-1],
+            "throughput": count / span if span > 0 else 0.0
+        }
+
+class OperationRunner:
+    """Runs operations on an executor and hands their results back through a queue.
+    
+    A new operation of a given kind supersedes the previous one: a pending
+    predecessor is cancelled and a running one has its result dropped.
+    Operations submitted with kind None are never superseded. Callbacks only
+    run when the owning thread calls drain().
+    """
+    
+    def __init__(self, executor: Executor, stats: OperationStats,
+                 on_record: Optional[Callable[[OperationStats], None]] = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.executor = executor
+        self.stats = stats
+        self.on_record = on_record
+        self._clock = clock
+        self._completed = queue.Queue()
+        self._pending: Dict[Hashable, Future] = {}
+        self._generations: Dict[Hashable, int] = {}
+    
+    def submit(self, kind: Optional[Hashable], func: Callable[[], Any],
+               on_success: Callable[[Any], None], on_error: Callable[[BaseException], None]) -> Optional[int]:
+        """Run func on the executor and return its generation for kind (None if kind is None)."""
+        generation = None
+        if kind is not None:
+            previous = self._pending.get(kind)
+            if previous is not None:
+                previous.cancel()
+            generation = self._generations.get(kind, 0) + 1
+            self._generations[kind] = generation
+        
+        started = self._clock()
+        
+        def done(future: Future) -> None:
+            finished = self._clock()
+            self._completed.put(lambda: self._finish(kind, generation, future, started, finished, on_success, on_error))
+        
+        future = self.executor.submit(func)
+        if kind is not None:
+            self._pending[kind] = future
+        future.add_done_callback(done)
+        return generation
+    
+    def is_current(self, kind: Hashable, generation: Optional[int]) -> bool:
+        """Return True if generation is the latest operation submitted for kind."""
+        return self._generations.get(kind) == generation
+    
+    def drain(self, limit: int) -> int:
+        """Run up to limit completion callbacks on the calling thread and return how many ran."""
+        for count in range(limit):
+            try:
+                callback = self._completed.get_nowait()
+            except queue.Empty:
+                return count
+            callback()
+        return limit
+    
+    def _finish(self, kind, generation, future, started, finished, on_success, on_error) -> None:
+        """Record a completed operation and deliver its result if it is still current."""
+        if future.cancelled():
+            return
+        
+        error = future.exception()
+        self.stats.record(started, finished, error is None)
+        if self.on_record is not None:
+            self.on_record(self.stats)
+        
+        # Drop results from operations that were superseded while running
+        if kind is not None:
+            if not self.is_current(kind, generation):
+                return
+            self._pending.pop(kind, None)
+        
+        if error is not None:
+            on_error(error)
+            return
+        
+        try:
+            on_success(future.result())
+        except Exception as e:
+            on_error(e)
\ No newline at end of file
@@ -0,0 +1,265 @@
+# mcp_modules/ageni-qdrant/resilience.py
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Type
+from .config import Config
+
+# Defaults for the "resilience" config section; config.json only needs the keys it overrides
+DEFAULT_SETTINGS = {
+    "max_retries": 2,
+    "backoff_base": 0.2,
+    "backoff_max": 2.0,
+    "hedge_searches": True,
+    "hedge_workers": 8,
+    "failure_threshold": 5,
+    "reset_timeout": 30.0
+}
+
+# Per-operation timeouts in seconds, overridable via "resilience.timeouts.<operation>"
+DEFAULT_TIMEOUTS = {
+    "embedding": 15.0,
+    "generate": 60.0,
+    "create_collection": 10.0,
+    "upsert": 10.0,
+    "search": 5.0,
+    "list_collections": 5.0
+}
+
+class TransientError(Exception):
+    """A backend answered with an error that is worth retrying (e.g. HTTP 5xx or 429)."""
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend whose circuit breaker is open."""
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for a single backend."""
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+    
+    @property
+    def state(self) -> str:
+        """Current breaker state."""
+        with self._lock:
+            return self._state
+    
+    def allow(self) -> bool:
+        """Return True if a call may go through to the backend."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                # Let a single trial call through to probe the backend
+                self._state = self.HALF_OPEN
+                return True
+            return False
+    
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+    
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit once the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+class ResultCache:
+    """Small thread-safe LRU cache for last-known-good results."""
+    
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value."""
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+class Resilience:
+    """Timeouts, retries with jittered backoff, hedging and a circuit breaker for one backend."""
+    
+    HEDGE_MIN_SAMPLES = 20
+    LATENCY_WINDOW = 200
+    
+    def __init__(self, name: str, config: Config,
+                 sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.config = config
+        self._sleep = sleep
+        self._clock = clock
+        self._latencies: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+        self._hedge_workers = max(1, self.setting("hedge_workers"))
+        self._hedge_slots = threading.BoundedSemaphore(self._hedge_workers)
+        self.reset()
+    
+    def reset(self) -> None:
+        """Start over with a closed breaker and no latency history."""
+        self.breaker = CircuitBreaker(
+            failure_threshold=self.setting("failure_threshold"),
+            reset_timeout=self.setting("reset_timeout"),
+            clock=self._clock
+        )
+        with self._lock:
+            self._latencies.clear()
+    
+    def close(self) -> None:
+        """Shut down the hedge pool; later calls still work but are never hedged.
+        
+        Requests already running are not interrupted and finish within their timeout.
+        """
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def setting(self, name: str) -> Any:
+        """Get a resilience setting, falling back to DEFAULT_SETTINGS."""
+        return self.config.get(f"resilience.{name}", DEFAULT_SETTINGS[name])
+    
+    def timeout(self, operation: str) -> float:
+        """Get the timeout for an operation."""
+        return self.config.get(f"resilience.timeouts.{operation}", DEFAULT_TIMEOUTS.get(operation, 10.0))
+    
+    def hedge_delay(self, operation: str) -> Optional[float]:
+        """Get the p95 latency of an operation, or None until enough samples exist."""
+        with self._lock:
+            samples = sorted(self._latencies.get(operation, ()))
+        if len(samples) < self.HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    
+    def call(self, operation: str, func: Callable[[float], Any],
+             retry_on: Tuple[Type[BaseException], ...] = (Exception,), hedge: bool = False) -> Any:
+        """Call func(timeout) with retries, optional hedging and the circuit breaker.
+        
+        Only exceptions in retry_on are retried and counted against the breaker;
+        anything else means the backend answered and is raised straight away.
+        """
+        # Hold on to this breaker so a concurrent reset() cannot split a call across two
+        breaker = self.breaker
+        timeout = self.timeout(operation)
+        attempts = 1 + max(0, self.setting("max_retries"))
+        
+        for attempt in range(attempts):
+            if not breaker.allow():
+                raise CircuitOpenError(f"{self.name} circuit is open; skipping {operation}")
+            
+            # Only hedge a first attempt against a healthy backend, never a retry or a probe
+            hedge_attempt = hedge and attempt == 0 and breaker.state == CircuitBreaker.CLOSED
+            try:
+                result = self._attempt(operation, func, timeout, hedge_attempt)
+            except retry_on:
+                breaker.record_failure()
+                if attempt == attempts - 1:
+                    raise
+                self._sleep(self._backoff(attempt))
+            except Exception:
+                breaker.record_success()
+                raise
+            else:
+                breaker.record_success()
+                return result
+    
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        base = self.setting("backoff_base")
+        cap = self.setting("backoff_max")
+        return random.uniform(0, min(cap, base * (2 ** attempt)))
+    
+    def _attempt(self, operation: str, func: Callable[[float], Any], timeout: float, hedge: bool) -> Any:
+        """Make one attempt, sending a hedged duplicate if the first is slower than p95.
+        
+        Hedged requests only run on free workers of the hedge pool and are never
+        queued. A losing request cannot be cancelled, but it only holds its own
+        worker, so at worst it disables hedging until it times out.
+        """
+        delay = self.hedge_delay(operation) if hedge else None
+        primary = self._submit_hedged(operation, func, timeout) if delay is not None else None
+        if primary is None:
+            return self._timed(operation, func, timeout)
+        
+        # wait() rather than result(timeout=...): on Python 3.11+ the future's
+        # timeout is the builtin TimeoutError, which the request itself may raise
+        done, _ = wait([primary], timeout=delay)
+        if primary in done:
+            return primary.result()
+        
+        secondary = self._submit_hedged(operation, func, timeout)
+        if secondary is None:
+            return primary.result()
+        
+        pending = {primary, secondary}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+    
+    def _timed(self, operation: str, func: Callable[[float], Any], timeout: float) -> Any:
+        """Run func and record its latency if it succeeds."""
+        started = self._clock()
+        result = func(timeout)
+        elapsed = self._clock() - started
+        with self._lock:
+            self._latencies.setdefault(operation, deque(maxlen=self.LATENCY_WINDOW)).append(elapsed)
+        return result
+    
+    def _submit_hedged(self, operation: str, func: Callable[[float], Any], timeout: float) -> Optional[Future]:
+        """Run func on the hedge pool if a worker is free, otherwise return None."""
+        if not self._hedge_slots.acquire(blocking=False):
+            return None
+        executor = self._hedge_executor()
+        if executor is None:
+            self._hedge_slots.release()
+            return None
+        future = executor.submit(self._timed, operation, func, timeout)
+        future.add_done_callback(lambda _: self._hedge_slots.release())
+        return future
+    
+    def _hedge_executor(self) -> Optional[ThreadPoolExecutor]:
+        """Get the pool used for hedged requests, creating it on first use, or None once closed."""
+        with self._lock:
+            if self._closed:
+                return None
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._hedge_workers, thread_name_prefix=f"{self.name}-hedge")
+            return self._executor
\ No newline at end of file
@@ -0,0 +1,24 @@
+# mcp_modules/ageni-qdrant/tests/conftest.py
+import os
+import sys
+import types
+import pytest
+
+# The module directory is not an importable name, so load it as a package under a stand-in name
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if "ageni_qdrant" not in sys.modules:
+    package = types.ModuleType("ageni_qdrant")
+    package.__path__ = [ROOT]
+    sys.modules["ageni_qdrant"] = package
+
+from ageni_qdrant.config import Config
+
+@pytest.fixture
+def config(tmp_path):
+    """A complete configuration stored in a temporary directory."""
+    config = Config(str(tmp_path / "config.json"))
+    config.set("openrouter.api_key", "test-key")
+    config.set("resilience.max_retries", 2)
+    config.set("resilience.failure_threshold", 3)
+    config.set("resilience.reset_timeout", 10.0)
+    return config
\ No newline at end of file
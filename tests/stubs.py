@@ -0,0 +1,152 @@
+# mcp_modules/ageni-qdrant/tests/stubs.py
+import json
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Tuple
+
+class FakeClock:
+    """Manually advanced clock whose sleep() records delays instead of blocking."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+class FaultyCall:
+    """Callable for Resilience.call that plays back a script of outcomes.
+
+    Each outcome is raised if it is an exception, called if it is callable,
+    and returned otherwise. Calls past the end of the script return "ok".
+    """
+
+    def __init__(self, *outcomes: Any):
+        self.outcomes = list(outcomes)
+        self.timeouts: List[float] = []
+        self._lock = threading.Lock()
+
+    @property
+    def calls(self) -> int:
+        return len(self.timeouts)
+
+    def __call__(self, timeout: float) -> Any:
+        with self._lock:
+            self.timeouts.append(timeout)
+            outcome = self.outcomes.pop(0) if self.outcomes else "ok"
+        if isinstance(outcome, BaseException):
+            raise outcome
+        if callable(outcome):
+            return outcome()
+        return outcome
+
+class ManualExecutor:
+    """Executor that only runs submitted jobs when a test calls run()."""
+
+    def __init__(self):
+        self.jobs: List[Tuple[Future, Callable[[], Any]]] = []
+
+    def submit(self, func: Callable[[], Any]) -> Future:
+        future = Future()
+        self.jobs.append((future, func))
+        return future
+
+    def start(self, index: int = 0) -> Tuple[Future, Callable[[], Any]]:
+        """Mark a job as running without finishing it, as a worker thread would."""
+        future, func = self.jobs.pop(index)
+        future.set_running_or_notify_cancel()
+        return future, func
+
+    def run(self, index: int = 0) -> None:
+        """Run a job to completion unless it was cancelled."""
+        future, func = self.jobs.pop(index)
+        if not future.set_running_or_notify_cancel():
+            return
+        finish(future, func)
+
+def finish(future: Future, func: Callable[[], Any]) -> None:
+    """Complete a running future with the result or exception of func."""
+    try:
+        future.set_result(func())
+    except Exception as e:
+        future.set_exception(e)
+
+class StubServer:
+    """Local HTTP server that answers from a route table after scripted faults.
+
+    Each request first takes the next fault from `faults`: an int status code
+    is returned as-is, "drop" closes the connection without a response, and
+    ("slow", seconds) delays before answering normally. Routes map
+    (method, path) to a function of the parsed JSON body returning the
+    response body.
+    """
+
+    def __init__(self, routes: Dict[Tuple[str, str], Callable[[Any], Any]]):
+        self.routes = routes
+        self.faults: List[Any] = []
+        self.requests: List[Tuple[str, str]] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub._handle(self, "GET")
+
+            def do_POST(self):
+                stub._handle(self, "POST")
+
+            def do_PUT(self):
+                stub._handle(self, "PUT")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self._server.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "StubServer":
+        threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = json.loads(handler.rfile.read(length) or b"null")
+        self.requests.append((method, handler.path))
+        fault = self.faults.pop(0) if self.faults else None
+
+        if fault == "drop":
+            handler.close_connection = True
+            handler.connection.close()
+            return
+        if isinstance(fault, tuple) and fault[0] == "slow":
+            time.sleep(fault[1])
+        if isinstance(fault, int):
+            self._respond(handler, fault, {"status": "error"})
+            return
+
+        route = self.routes.get((method, handler.path))
+        if route is None:
+            self._respond(handler, 404, {"status": "not found"})
+        else:
+            self._respond(handler, 200, route(body))
+
+    def _respond(self, handler: BaseHTTPRequestHandler, status: int, payload: Any) -> None:
+        data = json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
\ No newline at end of file
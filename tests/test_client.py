@@ -0,0 +1,154 @@
+# mcp_modules/ageni-qdrant/tests/test_client.py
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("requests")
+
+from ageni_qdrant.client import OpenRouterClient, QdrantClient
+from ageni_qdrant.resilience import CircuitBreaker, Resilience
+from stubs import FakeClock, StubServer
+
+SEARCH_RESULT = [{"id": "1", "score": 0.9, "payload": {"text": "remembered"}}]
+
+def qdrant_routes():
+    return {
+        ("GET", "/collections"): lambda body: {"result": {"collections": [{"name": "character_alice"}]}},
+        ("POST", "/collections/character_alice/points/search"): lambda body: {"result": SEARCH_RESULT}
+    }
+
+def embedding_routes():
+    return {
+        ("POST", "/api/v1/embeddings"): lambda body: {
+            "object": "list",
+            "data": [{"object": "embedding", "index": 0, "embedding": [0.1, 0.2]}],
+            "model": body["model"],
+            "usage": {"prompt_tokens": 1, "total_tokens": 1}
+        }
+    }
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def qdrant_server():
+    with StubServer(qdrant_routes()) as server:
+        yield server
+
+@pytest.fixture
+def qdrant(config, clock, qdrant_server):
+    config.set("qdrant.host", "127.0.0.1")
+    config.set("qdrant.port", qdrant_server.port)
+    return QdrantClient(config, Resilience("qdrant", config, sleep=clock.sleep, clock=clock))
+
+@pytest.fixture
+def openrouter_server():
+    with StubServer(embedding_routes()) as server:
+        yield server
+
+@pytest.fixture
+def openrouter(config, clock, openrouter_server):
+    config.set("openrouter.base_url", f"{openrouter_server.url}/api/v1")
+    return OpenRouterClient(config, Resilience("openrouter", config, sleep=clock.sleep, clock=clock))
+
+def test_qdrant_search_retries_server_errors(qdrant, qdrant_server, clock):
+    qdrant_server.faults = [503, "drop"]
+
+    assert qdrant.search_vectors("character_alice", [0.1, 0.2]) == SEARCH_RESULT
+    assert len(qdrant_server.requests) == 3
+    assert len(clock.sleeps) == 2
+
+def test_qdrant_client_errors_are_not_retried(qdrant, qdrant_server):
+    assert qdrant.search_vectors("character_bob", [0.1, 0.2]) == []
+    assert len(qdrant_server.requests) == 1
+    assert qdrant.resilience.breaker.state == CircuitBreaker.CLOSED
+
+def test_qdrant_search_uses_cache_only_when_asked(qdrant, qdrant_server):
+    assert qdrant.search_vectors("character_alice", [0.1, 0.2]) == SEARCH_RESULT
+    qdrant_server.faults = [503] * 3
+
+    assert qdrant.search_vectors("character_alice", [0.1, 0.2], use_cache=True) == SEARCH_RESULT
+    assert qdrant.resilience.breaker.state == CircuitBreaker.OPEN
+
+    # With the circuit open the cache is served without touching the server
+    request_count = len(qdrant_server.requests)
+    assert qdrant.search_vectors("character_alice", [0.1, 0.2], use_cache=True) == SEARCH_RESULT
+    assert qdrant.search_vectors("character_alice", [0.1, 0.2]) == []
+    assert len(qdrant_server.requests) == request_count
+
+def test_qdrant_check_connection_ignores_cache(qdrant, qdrant_server):
+    assert qdrant.check_connection() == ["character_alice"]
+    qdrant_server.faults = [503] * 3
+
+    assert qdrant.list_collections(use_cache=True) == ["character_alice"]
+    with pytest.raises(Exception):
+        qdrant.check_connection()
+
+def test_qdrant_reconfigure_drops_cached_results(qdrant, qdrant_server, config):
+    assert qdrant.search_vectors("character_alice", [0.1, 0.2]) == SEARCH_RESULT
+
+    config.set("qdrant.port", 1)
+    qdrant.configure()
+    assert qdrant.base_url == "http://127.0.0.1:1"
+    assert qdrant.resilience.breaker.state == CircuitBreaker.CLOSED
+    assert qdrant._endpoint.search_cache.get(("character_alice", 10, (0.1, 0.2))) is None
+
+def test_openrouter_embedding_retries_server_errors(openrouter, openrouter_server, clock):
+    openrouter_server.faults = [500]
+
+    assert openrouter.get_embedding("hello") == [0.1, 0.2]
+    assert len(openrouter_server.requests) == 2
+    assert len(clock.sleeps) == 1
+
+def test_openrouter_embedding_fallback_is_opt_in(openrouter, openrouter_server):
+    assert openrouter.get_embedding("hello") == [0.1, 0.2]
+    openrouter_server.faults = [500] * 3
+
+    assert openrouter.get_embedding("hello", use_cache=True) == [0.1, 0.2]
+    assert openrouter.get_embedding("hello") == []
+    with pytest.raises(Exception):
+        openrouter.check_connection()
+def test_qdrant_unchanged_configure_keeps_state(qdrant, qdrant_server):
+    assert qdrant.search_vectors("character_alice", [0.1, 0.2]) == SEARCH_RESULT
+    qdrant_server.faults = [503] * 3
+    qdrant.search_vectors("character_alice", [0.1, 0.2])
+    endpoint = qdrant._endpoint
+    breaker = qdrant.resilience.breaker
+
+    qdrant.configure()
+    assert qdrant._endpoint is endpoint
+    assert qdrant.resilience.breaker is breaker
+    assert breaker.state == CircuitBreaker.OPEN
+    assert qdrant.search_vectors("character_alice", [0.1, 0.2], use_cache=True) == SEARCH_RESULT
+
+def test_openrouter_unchanged_configure_keeps_client_and_cache(openrouter, config):
+    assert openrouter.get_embedding("hello") == [0.1, 0.2]
+    endpoint = openrouter._endpoint
+    breaker = openrouter.resilience.breaker
+
+    openrouter.configure()
+    assert openrouter._endpoint is endpoint
+    assert openrouter.resilience.breaker is breaker
+
+    # A model change keeps the connection and cache but not the endpoint
+    config.set("openrouter.model", "other/model")
+    openrouter.configure()
+    assert openrouter._endpoint.client is endpoint.client
+    assert openrouter._endpoint.embedding_cache is endpoint.embedding_cache
+    assert not endpoint.client.is_closed()
+
+def test_openrouter_key_change_closes_replaced_client(openrouter, config):
+    old_client = openrouter._endpoint.client
+    config.set("openrouter.api_key", "new-key")
+    openrouter.configure()
+
+    assert openrouter._endpoint.client is not old_client
+    assert old_client.is_closed()
+def test_close_releases_connections(qdrant, openrouter):
+    client = openrouter._endpoint.client
+    openrouter.close()
+    qdrant.close()
+
+    assert client.is_closed()
+    assert openrouter.resilience._closed
+    assert qdrant.resilience._closed
\ No newline at end of file
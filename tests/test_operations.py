@@ -0,0 +1,154 @@
+# mcp_modules/ageni-qdrant/tests/test_operations.py
+import pytest
+from ageni_qdrant.operations import OperationRunner, OperationStats
+from stubs import FakeClock, ManualExecutor, finish
+
+class Recorder:
+    """Collects results and errors delivered by the runner."""
+
+    def __init__(self):
+        self.results = []
+        self.errors = []
+
+    def on_success(self, result):
+        self.results.append(result)
+
+    def on_error(self, error):
+        self.errors.append(error)
+
+@pytest.fixture
+def executor():
+    return ManualExecutor()
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def runner(executor, clock):
+    return OperationRunner(executor, OperationStats(window=10), clock=clock)
+
+def test_results_are_delivered_only_on_drain(runner, executor):
+    recorder = Recorder()
+    runner.submit("results", lambda: "found", recorder.on_success, recorder.on_error)
+    executor.run()
+
+    assert recorder.results == []
+    assert runner.drain(10) == 1
+    assert recorder.results == ["found"]
+
+def test_pending_request_is_cancelled_when_superseded(runner, executor):
+    old, new = Recorder(), Recorder()
+    runner.submit("results", lambda: "old", old.on_success, old.on_error)
+    generation = runner.submit("results", lambda: "new", new.on_success, new.on_error)
+    executor.run(0)
+    executor.run(0)
+    runner.drain(10)
+
+    assert old.results == []
+    assert new.results == ["new"]
+    assert runner.is_current("results", generation)
+    # Cancelled requests never ran, so only one operation is recorded
+    assert runner.stats.summary()["count"] == 1
+
+def test_running_request_result_is_dropped_when_superseded(runner, executor):
+    old, new = Recorder(), Recorder()
+    old_generation = runner.submit("results", lambda: "old", old.on_success, old.on_error)
+    old_future, old_func = executor.start()
+    runner.submit("results", lambda: "new", new.on_success, new.on_error)
+
+    finish(old_future, old_func)
+    executor.run()
+    runner.drain(10)
+
+    assert not runner.is_current("results", old_generation)
+    assert old.results == []
+    assert new.results == ["new"]
+    assert runner.stats.summary()["count"] == 2
+
+def test_unkeyed_requests_are_never_superseded(runner, executor):
+    recorder = Recorder()
+    runner.submit(None, lambda: 1, recorder.on_success, recorder.on_error)
+    runner.submit(None, lambda: 2, recorder.on_success, recorder.on_error)
+    executor.run()
+    executor.run()
+    runner.drain(10)
+
+    assert recorder.results == [1, 2]
+
+def test_kinds_are_independent(runner, executor):
+    results, test = Recorder(), Recorder()
+    runner.submit("results", lambda: "memories", results.on_success, results.on_error)
+    runner.submit("test", lambda: "connected", test.on_success, test.on_error)
+    executor.run()
+    executor.run()
+    runner.drain(10)
+
+    assert results.results == ["memories"]
+    assert test.results == ["connected"]
+
+def test_worker_and_callback_errors_go_to_on_error(runner, executor):
+    recorder = Recorder()
+
+    def fail():
+        raise ValueError("backend down")
+
+    def broken_success(result):
+        raise KeyError("keywords")
+
+    runner.submit(None, fail, recorder.on_success, recorder.on_error)
+    runner.submit(None, lambda: "ok", broken_success, recorder.on_error)
+    executor.run()
+    executor.run()
+    runner.drain(10)
+
+    assert [type(e) for e in recorder.errors] == [ValueError, KeyError]
+    assert runner.stats.summary()["errors"] == 1
+
+def test_drain_respects_batch_limit(runner, executor):
+    recorder = Recorder()
+    for i in range(5):
+        runner.submit(None, lambda i=i: i, recorder.on_success, recorder.on_error)
+        executor.run()
+
+    assert runner.drain(2) == 2
+    assert recorder.results == [0, 1]
+    assert runner.drain(10) == 3
+
+def test_on_record_sees_updated_stats(executor, clock):
+    seen = []
+    runner = OperationRunner(executor, OperationStats(), on_record=lambda stats: seen.append(stats.summary()["count"]),
+                             clock=clock)
+    runner.submit(None, lambda: None, lambda result: None, lambda error: None)
+    clock.advance(0.2)
+    executor.run()
+    runner.drain(10)
+
+    assert seen == [1]
+    assert runner.stats.summary()["max_ms"] == pytest.approx(200)
+
+def test_stats_summary_percentiles_and_throughput():
+    stats = OperationStats(window=20)
+    assert stats.summary() is None
+
+    # Twenty back-to-back operations taking 10, 20, ..., 200 ms
+    started = 0.0
+    for i in range(1, 21):
+        stats.record(started, started + i / 100, ok=i % 10 != 0)
+        started += i / 100
+
+    summary = stats.summary()
+    assert summary["count"] == 20
+    assert summary["errors"] == 2
+    assert summary["p50_ms"] == pytest.approx(100)
+    assert summary["p95_ms"] == pytest.approx(200)
+    assert summary["max_ms"] == pytest.approx(200)
+    assert summary["throughput"] == pytest.approx(20 / 2.1)
+
+def test_stats_window_keeps_last_operations():
+    stats = OperationStats(window=3)
+    for latency in (5.0, 1.0, 1.0, 1.0):
+        stats.record(0.0, latency, ok=True)
+
+    assert stats.summary()["count"] == 3
+    assert stats.summary()["max_ms"] == pytest.approx(1000)
\ No newline at end of file
@@ -0,0 +1,161 @@
+# mcp_modules/ageni-qdrant/tests/test_resilience.py
+import threading
+import pytest
+from ageni_qdrant.resilience import CircuitBreaker, CircuitOpenError, ResultCache, Resilience, TransientError
+from stubs import FakeClock, FaultyCall
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def resilience(config, clock):
+    return Resilience("stub", config, sleep=clock.sleep, clock=clock)
+
+def prime_latencies(resilience, operation="search"):
+    """Record enough fast calls for hedging to kick in."""
+    for _ in range(Resilience.HEDGE_MIN_SAMPLES):
+        resilience.call(operation, lambda timeout: "ok")
+
+def test_retries_transient_errors_with_jittered_backoff(resilience, clock):
+    func = FaultyCall(TransientError("503"), TransientError("503"), "result")
+
+    assert resilience.call("search", func, retry_on=(TransientError,)) == "result"
+    assert func.calls == 3
+    assert func.timeouts == [5.0, 5.0, 5.0]
+    # Full jitter: each delay is within [0, backoff_base * 2 ** attempt]
+    assert len(clock.sleeps) == 2
+    assert 0 <= clock.sleeps[0] <= 0.2
+    assert 0 <= clock.sleeps[1] <= 0.4
+
+def test_backoff_is_capped(resilience, config):
+    config.set("resilience.backoff_max", 0.5)
+    assert all(resilience._backoff(attempt) <= 0.5 for attempt in range(10))
+
+def test_gives_up_after_max_retries(resilience, clock):
+    func = FaultyCall(*[TransientError("503")] * 5)
+
+    with pytest.raises(TransientError):
+        resilience.call("search", func, retry_on=(TransientError,))
+    assert func.calls == 3
+    assert len(clock.sleeps) == 2
+
+def test_non_retryable_errors_are_raised_immediately(resilience):
+    func = FaultyCall(ValueError("bad request"))
+
+    with pytest.raises(ValueError):
+        resilience.call("search", func, retry_on=(TransientError,))
+    assert func.calls == 1
+    assert resilience.breaker.state == CircuitBreaker.CLOSED
+
+def test_breaker_opens_fails_fast_and_recovers(resilience, clock):
+    with pytest.raises(TransientError):
+        resilience.call("search", FaultyCall(*[TransientError("down")] * 3), retry_on=(TransientError,))
+    assert resilience.breaker.state == CircuitBreaker.OPEN
+
+    func = FaultyCall()
+    with pytest.raises(CircuitOpenError):
+        resilience.call("search", func)
+    assert func.calls == 0
+
+    # After the reset timeout a single probe goes through and closes the circuit
+    clock.advance(10.0)
+    assert resilience.call("search", func) == "ok"
+    assert func.calls == 1
+    assert resilience.breaker.state == CircuitBreaker.CLOSED
+
+def test_failed_half_open_probe_reopens_breaker(resilience, clock):
+    with pytest.raises(TransientError):
+        resilience.call("search", FaultyCall(*[TransientError("down")] * 3), retry_on=(TransientError,))
+    clock.advance(10.0)
+
+    probe = FaultyCall(TransientError("still down"), "ok")
+    with pytest.raises(CircuitOpenError):
+        resilience.call("search", probe, retry_on=(TransientError,))
+    assert probe.calls == 1
+    assert resilience.breaker.state == CircuitBreaker.OPEN
+
+def test_half_open_allows_one_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=1.0, clock=clock)
+    breaker.record_failure()
+    clock.advance(1.0)
+
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+def test_hedged_request_wins_over_slow_primary(config):
+    resilience = Resilience("stub", config)
+    prime_latencies(resilience)
+    release = threading.Event()
+    func = FaultyCall(lambda: release.wait(5) and "primary", "hedge")
+
+    try:
+        assert resilience.call("search", func, hedge=True) == "hedge"
+        assert func.calls == 2
+    finally:
+        release.set()
+
+def test_fast_timeout_error_is_raised_not_hedged(config):
+    resilience = Resilience("stub", config)
+    prime_latencies(resilience)
+    func = FaultyCall(TimeoutError("read timed out"), "hedge")
+
+    with pytest.raises(TimeoutError):
+        resilience.call("search", func, retry_on=(TransientError,), hedge=True)
+    assert func.calls == 1
+
+def test_no_hedge_while_breaker_not_closed(config, clock):
+    resilience = Resilience("stub", config, sleep=clock.sleep)
+    prime_latencies(resilience)
+    resilience.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=1.0, clock=clock)
+    resilience.breaker.record_failure()
+    clock.advance(1.0)
+
+    func = FaultyCall("probe")
+    assert resilience.call("search", func, hedge=True) == "probe"
+    assert func.calls == 1
+
+def test_no_hedge_without_free_worker(config):
+    config.set("resilience.hedge_workers", 2)
+    resilience = Resilience("stub", config)
+    prime_latencies(resilience)
+    release = threading.Event()
+    for _ in range(2):
+        resilience._submit_hedged("other", lambda timeout: release.wait(5), 5.0)
+
+    try:
+        func = FaultyCall("inline")
+        assert resilience.call("search", func, hedge=True) == "inline"
+        assert func.calls == 1
+    finally:
+        release.set()
+
+def test_close_stops_hedging_but_not_calls(config):
+    resilience = Resilience("stub", config)
+    prime_latencies(resilience)
+    resilience._submit_hedged("search", lambda timeout: "warm", 1.0).result()
+    executor = resilience._executor
+
+    resilience.close()
+    assert executor._shutdown
+    func = FaultyCall("inline")
+    assert resilience.call("search", func, hedge=True) == "inline"
+    assert func.calls == 1
+    assert resilience._executor is None
+
+def test_timeouts_fall_back_to_defaults(resilience, config):
+    assert resilience.timeout("embedding") == 15.0
+    config.set("resilience.timeouts", {"embedding": 3.0})
+    assert resilience.timeout("embedding") == 3.0
+
+def test_result_cache_evicts_least_recently_used():
+    cache = ResultCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
\ No newline at end of file